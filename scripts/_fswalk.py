@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Shared directory traversal helpers
+
+单次遍历目录树，同时得到总大小和按扩展名的文件计数，
+供 cleanup_materials.py 与 fetch_source.py 共用
+"""
+
+import os
+import stat
+from collections import deque
+
+
+# POSIX 上使用 os.fwalk：子目录通过 dir_fd 相对打开（openat），
+# 避免每次都从根开始重新解析完整路径；Windows 等平台回退到 scandir 队列
+_HAVE_FWALK = hasattr(os, 'fwalk') and os.stat in os.supports_dir_fd
+
+
+def scan_tree(path, exclude=('.git',), skip_hidden=False):
+    """
+    单次迭代遍历目录树（不跟随符号链接）
+
+    Args:
+        path: 根目录
+        exclude: 需要整棵跳过的目录名
+        skip_hidden: 是否同时跳过所有以 '.' 开头的目录
+
+    Returns:
+        (total_size, ext_counts)：常规文件总字节数，以及
+        {小写扩展名（如 '.py'，无扩展名为 ''）: 文件数}
+    """
+    if _HAVE_FWALK:
+        return _scan_tree_fwalk(path, exclude, skip_hidden)
+
+    total_size = 0
+    ext_counts = {}
+    pending = deque([path])
+
+    while pending:
+        current = pending.popleft()
+        try:
+            with os.scandir(current) as it:
+                for entry in it:
+                    # 单个条目出错（权限、竞争删除）时跳过，不中断整个遍历
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            name = entry.name
+                            if name in exclude or (skip_hidden and name.startswith('.')):
+                                continue
+                            pending.append(entry.path)
+                            continue
+                        if not entry.is_file(follow_symlinks=False):
+                            continue
+                        size = entry.stat(follow_symlinks=False).st_size
+                    except OSError:
+                        continue
+
+                    total_size += size
+
+                    name = entry.name
+                    dot = name.rfind('.')
+                    ext = name[dot:].lower() if dot > 0 else ''
+                    ext_counts[ext] = ext_counts.get(ext, 0) + 1
+        except OSError:
+            pass
+
+    return total_size, ext_counts
+
+
+def _scan_tree_fwalk(path, exclude, skip_hidden):
+    """scan_tree 的 os.fwalk 实现（参数与返回值同 scan_tree）"""
+    total_size = 0
+    ext_counts = {}
+
+    # follow_symlinks=False 时 os.fwalk 遇到符号链接形式的根目录不会产出任何结果；
+    # 先解析根路径，与 scandir 实现一致（根目录跟随链接，树内链接不跟随）
+    root = os.path.realpath(path)
+
+    # onerror 默认为 None：无法打开的目录直接跳过
+    for _, dirs, files, rootfd in os.fwalk(root, follow_symlinks=False):
+        dirs[:] = [name for name in dirs
+                   if name not in exclude and not (skip_hidden and name.startswith('.'))]
+
+        for name in files:
+            try:
+                st = os.stat(name, dir_fd=rootfd, follow_symlinks=False)
+            except OSError:
+                continue
+            # files 中包含符号链接等非常规文件，只统计常规文件
+            if not stat.S_ISREG(st.st_mode):
+                continue
+
+            total_size += st.st_size
+
+            dot = name.rfind('.')
+            ext = name[dot:].lower() if dot > 0 else ''
+            ext_counts[ext] = ext_counts.get(ext, 0) + 1
+
+    return total_size, ext_counts
@@ -24,9 +24,14 @@ Usage:
 import os
 import sys
 import argparse
+import functools
 import shutil
+import subprocess
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 
+from _fswalk import scan_tree
+
 
 def find_project_root(start_path=None):
     """
@@ -43,14 +48,30 @@ def find_project_root(start_path=None):
     else:
         start_path = Path(start_path)
 
-    current = start_path.resolve()
+    root = _find_project_root_cached(str(start_path.resolve()))
+    return Path(root) if root is not None else None
+
 
+@functools.lru_cache(maxsize=8)
+def _find_project_root_cached(current):
+    """
+    按已解析的起始路径缓存查找结果（同一进程内 cwd 不变，多次调用只查找一次）
+
+    循环内只做 os.path 字符串操作，避免每层构造 Path 对象；返回 str 或 None
+    """
     # 向上查找，直到根目录
-    while current != current.parent:
-        # 检查是否有 .git 或 .claude
-        if (current / '.git').exists() or (current / '.claude').exists():
+    parent = os.path.dirname(current)
+    while current != parent:
+        # 检查是否有 .git 或 .claude（一次 scandir 代替两次 stat）
+        try:
+            with os.scandir(current) as it:
+                names = {entry.name for entry in it}
+        except OSError:
+            names = set()
+
+        if '.git' in names or '.claude' in names:
             return current
-        current = current.parent
+        current, parent = parent, os.path.dirname(parent)
 
     return None
 
@@ -95,59 +116,108 @@ def get_materials_dir():
 
 def get_dir_size(path):
     """计算目录大小（字节）"""
-    total = 0
-    try:
-        for entry in os.scandir(path):
-            if entry.is_file(follow_symlinks=False):
-                total += entry.stat().st_size
-            elif entry.is_dir(follow_symlinks=False):
-                total += get_dir_size(entry.path)
-    except PermissionError:
-        pass
-    return total
+    total_size, _ = scan_tree(path, exclude=())
+    return total_size
+
+
+_SIZE_UNITS = ('B', 'KB', 'MB', 'GB', 'TB')
 
 
 def format_size(bytes_size):
     """格式化文件大小"""
-    for unit in ['B', 'KB', 'MB', 'GB']:
-        if bytes_size < 1024.0:
-            return f"{bytes_size:.1f} {unit}"
-        bytes_size /= 1024.0
-    return f"{bytes_size:.1f} TB"
+    # 由二进制位数直接得到单位（每 10 位为一级），代替逐级除以 1024
+    bytes_size = int(bytes_size)
+    unit_idx = max(0, min(4, (bytes_size.bit_length() - 1) // 10))
+    value = bytes_size / (1 << (unit_idx * 10))
+    return f"{value:.1f} {_SIZE_UNITS[unit_idx]}"
 
 
-def list_materials():
-    """列出所有材料及其大小（支持两个位置）"""
+def _print_no_materials_dirs():
+    """提示未找到任何材料目录"""
+    print(f"\n📂 No materials directories found")
+    print(f"   Checked:")
+    project_root = find_project_root()
+    if project_root:
+        print(f"   - {project_root}/.claude/temp-materials/ (project mode)")
+    print(f"   - ~/skill-materials/ (global mode)")
+
+
+def list_materials_paths_only():
+    """列出所有材料的名称与路径（不计算大小，每个材料目录只需一次 scandir）"""
     dirs = get_materials_dirs()
 
     if not dirs:
-        print(f"\n📂 No materials directories found")
-        print(f"   Checked:")
-        project_root = find_project_root()
-        if project_root:
-            print(f"   - {project_root}/.claude/temp-materials/ (project mode)")
-        print(f"   - ~/skill-materials/ (global mode)")
+        _print_no_materials_dirs()
         return []
 
-    materials = []
-
+    # 按名称去重显示：dirs 中项目模式在前，同名材料列出项目模式的一份，
+    # 被遮蔽的其他副本以 (mode, path) 记录在 duplicated_in 中（仍参与大小统计与批量删除）
+    materials = {}
     for materials_dir, mode in dirs:
-        for item in sorted(materials_dir.iterdir()):
-            if item.is_dir() and not item.name.startswith('.'):
-                size = get_dir_size(item)
-                materials.append({
-                    'name': item.name,
-                    'path': item,
-                    'size': size,
-                    'size_str': format_size(size),
-                    'mode': mode
-                })
+        with os.scandir(materials_dir) as it:
+            entries = sorted(it, key=lambda entry: entry.name)
+        for entry in entries:
+            if entry.is_dir() and not entry.name.startswith('.'):
+                existing = materials.get(entry.name)
+                if existing is not None:
+                    existing['duplicated_in'].append((mode, Path(entry.path)))
+                    continue
+                materials[entry.name] = {
+                    'name': entry.name,
+                    'path': Path(entry.path),
+                    'mode': mode,
+                    'duplicated_in': []
+                }
+
+    return list(materials.values())
+
+
+def list_materials():
+    """列出所有材料及其大小（支持两个位置）"""
+    materials = list_materials_paths_only()
+
+    if not materials:
+        return []
+
+    paths = [mat['path'] for mat in materials]
+    paths += [path for mat in materials for _, path in mat['duplicated_in']]
+
+    # 目录遍历是 I/O 密集型（系统调用期间释放 GIL），多线程并发计算各材料大小
+    with ThreadPoolExecutor(max_workers=min(32, len(paths))) as executor:
+        sizes = list(executor.map(get_dir_size, paths))
+
+    for mat, size in zip(materials, sizes):
+        mat['size'] = size
+        mat['size_str'] = format_size(size)
+
+    duplicated_sizes = iter(sizes[len(materials):])
+    for mat in materials:
+        mat['duplicated_sizes'] = [next(duplicated_sizes) for _ in mat['duplicated_in']]
 
     return materials
 
 
+def _expand_duplicates(materials):
+    """展开为所有待删除的材料目录（包括被同名项目材料遮蔽的其他副本）"""
+    expanded = []
+    for mat in materials:
+        expanded.append(mat)
+        sizes = mat.get('duplicated_sizes')
+        for i, (mode, path) in enumerate(mat['duplicated_in']):
+            copy = {
+                'name': f"{mat['name']} ({mode})",
+                'path': path,
+                'mode': mode
+            }
+            if sizes is not None:
+                copy['size'] = sizes[i]
+                copy['size_str'] = format_size(sizes[i])
+            expanded.append(copy)
+    return expanded
+
+
 def print_materials_list(materials):
-    """打印材料列表"""
+    """打印材料列表（整份报告拼接后一次写出）"""
     if not materials:
         print("\n✅ No materials found")
         return
@@ -156,7 +226,7 @@ def print_materials_list(materials):
     project_materials = [m for m in materials if m['mode'] == 'project']
     global_materials = [m for m in materials if m['mode'] == 'global']
 
-    print(f"\n📂 Source materials:\n")
+    parts = [f"\n📂 Source materials:\n\n"]
 
     index = 1
     total_size = 0
@@ -164,23 +234,49 @@ def print_materials_list(materials):
     # 项目模式材料
     if project_materials:
         project_root = find_project_root()
-        print(f"  📍 Project mode ({project_root}/.claude/temp-materials/):")
+        parts.append(f"  📍 Project mode ({project_root}/.claude/temp-materials/):\n")
         for mat in project_materials:
-            print(f"     {index}. {mat['name']:<28} {mat['size_str']:>10}")
-            total_size += mat['size']
+            parts.append(f"     {index}. {mat['name']:<28} {mat['size_str']:>10}")
+            if mat.get('duplicated_in'):
+                modes = ', '.join(mode for mode, _ in mat['duplicated_in'])
+                parts.append(f"  (also in: {modes})")
+            parts.append("\n")
+            total_size += mat['size'] + sum(mat.get('duplicated_sizes', ()))
             index += 1
-        print()
+        parts.append("\n")
 
     # 全局模式材料
     if global_materials:
-        print(f"  🌍 Global mode (~/skill-materials/):")
+        parts.append(f"  🌍 Global mode (~/skill-materials/):\n")
         for mat in global_materials:
-            print(f"     {index}. {mat['name']:<28} {mat['size_str']:>10}")
+            parts.append(f"     {index}. {mat['name']:<28} {mat['size_str']:>10}\n")
             total_size += mat['size']
             index += 1
-        print()
+        parts.append("\n")
+
+    parts.append(f"  Total: {len(materials)} projects, {format_size(total_size)}\n")
+
+    sys.stdout.write(''.join(parts))
+
+
+def _fast_rmtree(path):
+    """
+    删除目录树
+
+    POSIX 上调用 rm -rf；否则回退为 shutil.rmtree
+    （Windows 上它会把目录联接（junction）当作链接处理，不会进入联接目标删除其中的文件）
+    """
+    path = str(path)
+    if os.path.islink(path):
+        # 与 shutil.rmtree 一致：拒绝删除符号链接指向的目录
+        raise OSError(f"Cannot call rmtree on a symbolic link: {path}")
+
+    # POSIX 上直接交给 rm -rf：一个进程内完成全部 unlink/rmdir，无需 Python 逐个遍历
+    if sys.platform != 'win32' and shutil.which('rm'):
+        subprocess.run(['rm', '-rf', '--', path], check=True)
+        return
 
-    print(f"  Total: {len(materials)} projects, {format_size(total_size)}")
+    shutil.rmtree(path)
 
 
 def confirm_deletion(name, size_str):
@@ -198,14 +294,39 @@ def delete_material(material, force=False):
             return False
 
     try:
-        shutil.rmtree(material['path'])
-        print(f"   ✅ Deleted: {material['name']} ({material['size_str']})")
+        _fast_rmtree(material['path'])
+        if 'size_str' in material:
+            print(f"   ✅ Deleted: {material['name']} ({material['size_str']})")
+        else:
+            print(f"   ✅ Deleted: {material['name']}")
         return True
     except Exception as e:
         print(f"   ❌ Error deleting {material['name']}: {e}")
         return False
 
 
+def confirm_batch(materials):
+    """批量确认删除（列表已展示过，只需一次确认）"""
+    print(f"\n⚠️  WARNING: This will delete ALL {len(materials)} materials!")
+    confirm = input("   Type 'DELETE ALL' to confirm: ").strip()
+    return confirm == 'DELETE ALL'
+
+
+def delete_materials(materials):
+    """并发删除多个已确认的材料，返回成功删除的数量"""
+    if not materials:
+        return 0
+
+    deleted_count = 0
+    with ThreadPoolExecutor(max_workers=min(8, len(materials))) as executor:
+        futures = [executor.submit(delete_material, mat, True) for mat in materials]
+        for future in as_completed(futures):
+            if future.result():
+                deleted_count += 1
+
+    return deleted_count
+
+
 def interactive_cleanup():
     """交互式清理"""
     materials = list_materials()
@@ -228,14 +349,10 @@ def interactive_cleanup():
             break
 
         if response == 'all':
-            print(f"\n⚠️  WARNING: This will delete ALL {len(materials)} materials!")
-            confirm = input("   Type 'DELETE ALL' to confirm: ").strip()
-            if confirm == 'DELETE ALL':
-                deleted_count = 0
-                for mat in materials:
-                    if delete_material(mat, force=False):
-                        deleted_count += 1
-                print(f"\n✅ Deleted {deleted_count}/{len(materials)} materials")
+            targets = _expand_duplicates(materials)
+            if confirm_batch(targets):
+                deleted_count = delete_materials(targets)
+                print(f"\n✅ Deleted {deleted_count}/{len(targets)} materials")
             else:
                 print("   Cancelled")
             break
@@ -295,30 +412,31 @@ def cleanup_specific(name, force=False):
 
 def cleanup_all(force=False):
     """清理所有材料"""
-    materials = list_materials()
+    if force:
+        # 无需确认时不展示大小汇总，跳过逐个材料的大小遍历
+        materials = list_materials_paths_only()
 
-    if not materials:
-        return
+        if not materials:
+            return
 
-    print_materials_list(materials)
+        targets = _expand_duplicates(materials)
+        print(f"\n🗑️  Deleting {len(targets)} materials...")
+    else:
+        materials = list_materials()
 
-    if not force:
-        print(f"\n⚠️  WARNING: This will delete ALL {len(materials)} materials!")
-        confirm = input("   Type 'DELETE ALL' to confirm: ").strip()
-        if confirm != 'DELETE ALL':
+        if not materials:
+            return
+
+        print_materials_list(materials)
+
+        targets = _expand_duplicates(materials)
+        if not confirm_batch(targets):
             print("   Cancelled")
             return
 
-    deleted_count = 0
-    for mat in materials:
-        try:
-            shutil.rmtree(mat['path'])
-            deleted_count += 1
-            print(f"   ✅ Deleted: {mat['name']} ({mat['size_str']})")
-        except Exception as e:
-            print(f"   ❌ Error deleting {mat['name']}: {e}")
+    deleted_count = delete_materials(targets)
 
-    print(f"\n✅ Deleted {deleted_count}/{len(materials)} materials")
+    print(f"\n✅ Deleted {deleted_count}/{len(targets)} materials")
 
 
 def main():
@@ -22,12 +22,20 @@ Usage:
     result = detect_llms_txt("https://react.dev/")
 """
 
+import os
 import sys
-import requests
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from urllib.parse import urlparse
 from typing import Optional, Dict, List
 
 
+# 共享 Session：同一站点的探测与下载复用连接（keep-alive），省去重复的 TCP/TLS 握手
+# 首次发起网络请求时才创建（requests 导入开销较大，不联网的流程无需承担）
+_SESSION = None
+_SESSION_LOCK = threading.Lock()
+
+
 # 支持的 llms.txt 变体（按优先级排序）
 LLMS_TXT_VARIANTS = [
     ('llms-full.txt', 'full'),      # 完整版 - 最优先
@@ -55,10 +63,12 @@ def detect_llms_txt(base_url: str, timeout: int = 5) -> Optional[Dict[str, str]]
     parsed = urlparse(base_url)
     root_url = f"{parsed.scheme}://{parsed.netloc}"
 
-    for filename, variant in LLMS_TXT_VARIANTS:
-        url = f"{root_url}/{filename}"
+    urls = [f"{root_url}/{filename}" for filename, _ in LLMS_TXT_VARIANTS]
+    results = _probe_all(urls, timeout)
 
-        if _check_url_exists(url, timeout):
+    # 并发探测，但按优先级顺序返回第一个存在的变体
+    for (filename, variant), url, exists in zip(LLMS_TXT_VARIANTS, urls, results):
+        if exists:
             return {
                 'url': url,
                 'variant': variant,
@@ -87,12 +97,13 @@ def detect_all_variants(base_url: str, timeout: int = 5) -> List[Dict[str, str]]
     parsed = urlparse(base_url)
     root_url = f"{parsed.scheme}://{parsed.netloc}"
 
-    found_variants = []
+    urls = [f"{root_url}/{filename}" for filename, _ in LLMS_TXT_VARIANTS]
+    results = _probe_all(urls, timeout)
 
-    for filename, variant in LLMS_TXT_VARIANTS:
-        url = f"{root_url}/{filename}"
+    found_variants = []
 
-        if _check_url_exists(url, timeout):
+    for (filename, variant), url, exists in zip(LLMS_TXT_VARIANTS, urls, results):
+        if exists:
             found_variants.append({
                 'url': url,
                 'variant': variant,
@@ -114,28 +125,85 @@ def download_llms_txt(url: str, output_path: str, timeout: int = 10) -> bool:
     Returns:
         True if successful, False otherwise
     """
+    # 先写入同目录下的临时文件，完整下载后再 os.replace 为目标文件：
+    # 传输中断时不会留下截断的 output_path，已有的同名文件也保持不变
+    part_path = f"{output_path}.part"
     try:
-        response = requests.get(url, timeout=timeout)
-        response.raise_for_status()
+        # 流式写入磁盘：内存占用固定为单个 chunk，且原样保存服务器返回的字节（不做解码/重编码）
+        with _get_session().get(url, timeout=timeout, stream=True) as response:
+            response.raise_for_status()
 
-        with open(output_path, 'w', encoding='utf-8') as f:
-            f.write(response.text)
+            with open(part_path, 'wb') as f:
+                for chunk in response.iter_content(chunk_size=65536):
+                    f.write(chunk)
 
+        os.replace(part_path, output_path)
         return True
     except Exception as e:
+        try:
+            os.unlink(part_path)
+        except OSError:
+            pass
         print(f"Download failed: {e}")
         return False
 
 
+def _get_session():
+    """获取（必要时创建）共享的 requests.Session"""
+    global _SESSION
+
+    with _SESSION_LOCK:
+        if _SESSION is None:
+            import requests
+            from requests.adapters import HTTPAdapter
+
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=4, pool_maxsize=8)
+            session.mount('http://', adapter)
+            session.mount('https://', adapter)
+            _SESSION = session
+
+    return _SESSION
+
+
+def _probe_all(urls: List[str], timeout: int) -> List[bool]:
+    """
+    并发检查多个 URL 是否存在
+
+    各请求的等待时间相互重叠，总耗时约为最慢的一次请求而非所有请求之和
+
+    Returns:
+        与 urls 顺序一致的检查结果
+    """
+    if not urls:
+        return []
+
+    with ThreadPoolExecutor(max_workers=len(urls)) as executor:
+        return list(executor.map(lambda url: _check_url_exists(url, timeout), urls))
+
+
 def _check_url_exists(url: str, timeout: int) -> bool:
     """
     检查 URL 是否存在（返回 200 状态码）
 
-    使用 HEAD 请求以提高效率
+    优先使用 HEAD 请求；部分 CDN 对 HEAD 返回 403/405 而 GET 正常，
+    此时回退为只取首字节的 Range GET（接受 200/206）
     """
+    import requests
+
+    session = _get_session()
     try:
-        response = requests.head(url, timeout=timeout, allow_redirects=True)
-        return response.status_code == 200
+        response = session.head(url, timeout=timeout, allow_redirects=True)
+        if response.status_code in (200, 404):
+            return response.status_code == 200
+
+        with session.get(url, headers={'Range': 'bytes=0-0'}, stream=True,
+                         timeout=timeout) as response:
+            # 206 时读完这 1 字节响应体，连接才能归还连接池复用；
+            # 200 表示服务器忽略了 Range，直接关闭连接，避免下载整个文件
+            if response.status_code == 206:
+                response.content
+            return response.status_code in (200, 206)
     except requests.RequestException:
         return False
 
@@ -42,6 +42,8 @@ Options:
 import os
 import sys
 import argparse
+import functools
+import importlib.util
 import subprocess
 import shutil
 from pathlib import Path
@@ -52,10 +54,13 @@ try:
     script_dir = Path(__file__).parent
     sys.path.insert(0, str(script_dir))
     from detect_llms_txt import detect_llms_txt, download_llms_txt
-    LLMS_TXT_AVAILABLE = True
+    # detect_llms_txt 延迟导入 requests，这里只确认其已安装
+    LLMS_TXT_AVAILABLE = importlib.util.find_spec('requests') is not None
 except ImportError:
     LLMS_TXT_AVAILABLE = False
 
+from _fswalk import scan_tree
+
 
 def find_project_root(start_path=None):
     """
@@ -74,22 +79,39 @@ def find_project_root(start_path=None):
     else:
         start_path = Path(start_path)
 
-    current = start_path.resolve()
+    root = _find_project_root_cached(str(start_path.resolve()))
+    return Path(root) if root is not None else None
+
+
+@functools.lru_cache(maxsize=8)
+def _find_project_root_cached(current):
+    """
+    按已解析的起始路径缓存查找结果（同一进程内 cwd 不变，多次调用只查找一次）
 
+    循环内只做 os.path 字符串操作，避免每层构造 Path 对象；返回 str 或 None
+    """
     # 检测 skill-forge 工具目录（通过检查是否有 SKILL.md 且名称为 skill-forge）
-    script_dir = Path(__file__).parent.parent.resolve()  # skill-forge/
-    is_skill_forge_dir = (script_dir / 'SKILL.md').exists() and script_dir.name == 'skill-forge'
+    script_dir = os.path.dirname(os.path.dirname(os.path.realpath(__file__)))  # skill-forge/
+    is_skill_forge_dir = (os.path.basename(script_dir) == 'skill-forge'
+                          and os.path.exists(os.path.join(script_dir, 'SKILL.md')))
 
     # 向上查找，直到根目录
-    while current != current.parent:
-        # 检查是否有 .git 或 .claude
-        if (current / '.git').exists() or (current / '.claude').exists():
+    parent = os.path.dirname(current)
+    while current != parent:
+        # 检查是否有 .git 或 .claude（一次 scandir 代替两次 stat）
+        try:
+            with os.scandir(current) as it:
+                names = {entry.name for entry in it}
+        except OSError:
+            names = set()
+
+        if '.git' in names or '.claude' in names:
             # 排除 skill-forge 工具目录本身
             if is_skill_forge_dir and current == script_dir:
-                current = current.parent
+                current, parent = parent, os.path.dirname(parent)
                 continue
             return current
-        current = current.parent
+        current, parent = parent, os.path.dirname(parent)
 
     return None
 
@@ -162,6 +184,18 @@ def clone_repository(git_url, output_dir, depth=None, branch=None, single_branch
         return False
 
 
+# 文件扩展名 -> 统计字段
+_EXT_TO_BUCKET = {
+    '.py': 'py_files',
+    '.md': 'md_files',
+    '.js': 'js_files',
+    '.jsx': 'js_files',
+    '.ts': 'js_files',
+    '.tsx': 'js_files',
+    '.json': 'json_files',
+}
+
+
 def get_directory_stats(directory):
     """统计目录信息"""
     stats = {
@@ -173,39 +207,22 @@ def get_directory_stats(directory):
         'total_size': 0
     }
 
-    for root, dirs, files in os.walk(directory):
-        # 跳过 .git 目录
-        if '.git' in root:
-            continue
-
-        for file in files:
-            stats['total_files'] += 1
-            filepath = os.path.join(root, file)
-
-            try:
-                stats['total_size'] += os.path.getsize(filepath)
-            except OSError:
-                pass
-
-            if file.endswith('.py'):
-                stats['py_files'] += 1
-            elif file.endswith('.md'):
-                stats['md_files'] += 1
-            elif file.endswith('.js') or file.endswith('.jsx') or file.endswith('.ts') or file.endswith('.tsx'):
-                stats['js_files'] += 1
-            elif file.endswith('.json'):
-                stats['json_files'] += 1
+    # 单次遍历同时得到总大小与扩展名计数（跳过 .git 及其他隐藏目录）
+    total_size, ext_counts = scan_tree(directory, skip_hidden=True)
+
+    stats['total_size'] = total_size
+    for ext, count in ext_counts.items():
+        stats['total_files'] += count
+        bucket = _EXT_TO_BUCKET.get(ext)
+        if bucket:
+            stats[bucket] += count
 
     return stats
 
 
 def check_markitdown():
-    """检查 markitdown 是否已安装"""
-    try:
-        from markitdown import MarkItDown
-        return True
-    except ImportError:
-        return False
+    """检查 markitdown 是否已安装（只查找模块，不实际导入）"""
+    return importlib.util.find_spec('markitdown') is not None
 
 
 def fetch_documentation(docs_url, name, output_dir):
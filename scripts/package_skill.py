@@ -3,50 +3,267 @@
 Skill Packager - Creates a distributable zip file of a skill folder
 
 Usage:
-    python utils/package_skill.py <path/to/skill-folder> [output-directory]
+    python utils/package_skill.py <path/to/skill-folder> [output-directory] [--level N]
 
 Example:
     python utils/package_skill.py skills/public/my-skill
     python utils/package_skill.py skills/public/my-skill ./dist
+    python utils/package_skill.py skills/public/my-skill ./dist --level 9
 """
 
+import argparse
+import itertools
+import os
+import stat
 import sys
-import zipfile
+import time
 from pathlib import Path
-from quick_validate import validate_skill
 
+# Optional libdeflate backend (pip install deflate): faster than zlib at
+# equivalent levels; falls back to stdlib zlib when not installed
+try:
+    import deflate
+except ImportError:
+    deflate = None
 
-def package_skill(skill_path, output_dir=None):
+
+# Skill bundles are mostly text (markdown, scripts): level 1 is much faster
+# than zlib's default of 6 for a negligible size difference
+DEFAULT_COMPRESSLEVEL = 1
+
+# Formats whose payload is already compressed: stored without DEFLATE
+_NOCOMPRESS_EXT = frozenset({
+    '.png', '.jpg', '.jpeg', '.gif', '.webp',
+    '.mp4', '.webm', '.mp3', '.ogg', '.pdf',
+    '.zip', '.gz', '.xz', '.bz2', '.7z',
+    '.woff', '.woff2',
+})
+
+# Read size for streaming files into the archive (stdlib default is 64 KiB);
+# one buffer of this size is reused for every file in an archive
+_COPY_BUFSIZE = 1 << 20
+
+# Below this much input, worker start-up costs more than parallel compression saves
+_PARALLEL_MIN_BYTES = 4 * 1024 * 1024
+
+
+class _PassThroughCompressor:
+    """Stands in for zlib's compressor when entry data is already raw DEFLATE"""
+
+    def compress(self, data):
+        return data
+
+    def flush(self):
+        return b''
+
+
+def _compress_raw(data, level):
+    """Compress data to a raw DEFLATE stream, using libdeflate when installed."""
+    if deflate is not None:
+        return deflate.deflate_compress(data, level)
+
+    import zlib
+
+    compressor = zlib.compressobj(level, zlib.DEFLATED, -15)
+    return compressor.compress(data) + compressor.flush()
+
+
+def _compress_file(path, level):
+    """Read a file and return (crc32, size, raw DEFLATE bytes); runs in worker processes."""
+    import zlib
+
+    with open(path, 'rb') as f:
+        data = f.read()
+    return zlib.crc32(data), len(data), _compress_raw(data, level)
+
+
+def _iter_compressed(paths, level, parallel):
+    """Yield _compress_file results for paths in order, optionally via a process pool."""
+    if not parallel:
+        for path in paths:
+            yield _compress_file(path, level)
+        return
+
+    # DEFLATE is CPU-bound and each zip entry is an independent stream, so
+    # separate processes (not threads) compress files on all cores
+    from concurrent.futures import ProcessPoolExecutor
+
+    # No more workers than files: each extra process only adds start-up cost
+    with ProcessPoolExecutor(max_workers=min(len(paths), os.cpu_count() or 1)) as executor:
+        yield from executor.map(_compress_file, paths, itertools.repeat(level))
+
+
+def _is_precompressed_format(name):
+    """Whether a file's extension marks it as already compressed (images, media, archives)."""
+    return os.path.splitext(name)[1].lower() in _NOCOMPRESS_EXT
+
+
+def _write_precompressed(zipf, zinfo, raw, crc, size):
+    """
+    Append an entry whose data has already been DEFLATE-compressed.
+
+    Goes through ZipFile.open() so headers, offsets and the central directory
+    are handled by zipfile itself; only the compressor is swapped for a
+    pass-through and the CRC/size are set to those of the uncompressed data.
+    zinfo must already be marked ZIP_DEFLATED.
+    """
+    zinfo.file_size = size
+    with zipf.open(zinfo, 'w') as dest:
+        dest._compressor = _PassThroughCompressor()
+        dest.write(raw)
+        # write() tracked CRC/size of the compressed bytes; fix up before close
+        dest._crc = crc
+        dest._file_size = size
+
+
+def _scandir_filtered(root, allowed_dirs, allowed_files, parent_len, skipped=None):
+    """
+    Yield (path, arcname, entry) for files that belong in the package.
+
+    Every entry is judged by its '/'-separated path relative to the skill
+    directory: files are included when the path is one of allowed_files or
+    starts with an allowed directory prefix (and is not .pyc); directories
+    are entered only under those prefixes, and never for __pycache__. The
+    walk uses an explicit stack and plain path strings; arcname is the path
+    relative to the skill's parent directory, sliced from the entry path.
+
+    Args:
+        root: Skill directory (str)
+        allowed_dirs: Top-level directory names to package
+        allowed_files: Top-level file names to package
+        parent_len: Length of the skill parent path plus separator
+        skipped: Optional list collecting arcnames of excluded entries
+            (directories with a trailing '/', as in zip archives)
+    """
+    # One C-level str.startswith(tuple) call tests all allowed prefixes
+    allowed_prefixes = tuple(f"{name}/" for name in allowed_dirs)
+    root_len = len(os.path.join(root, ''))
+    normalize = os.sep != '/'
+
+    stack = [root]
+    while stack:
+        with os.scandir(stack.pop()) as it:
+            for entry in it:
+                path = entry.path
+                rel = path[root_len:]
+                if normalize:
+                    rel = rel.replace(os.sep, '/')
+
+                if entry.is_dir(follow_symlinks=False):
+                    if (rel + '/').startswith(allowed_prefixes) and entry.name != '__pycache__':
+                        stack.append(path)
+                    elif skipped is not None:
+                        skipped.append(path[parent_len:] + '/')
+                elif entry.is_file():
+                    if rel in allowed_files or (rel.startswith(allowed_prefixes)
+                                                and not rel.endswith('.pyc')):
+                        yield path, path[parent_len:], entry
+                    elif skipped is not None:
+                        skipped.append(path[parent_len:])
+
+
+def _write_archive(fileobj, files, compresslevel):
+    """
+    Write the collected (path, arcname, entry) files into a zip on fileobj.
+
+    Args:
+        fileobj: Binary file object to write the archive to
+        files: Files from _scandir_filtered, in archive order
+        compresslevel: Deflate level 0-9
+    """
+    import zipfile
+
+    with zipfile.ZipFile(fileobj, 'w', zipfile.ZIP_DEFLATED,
+                         compresslevel=compresslevel) as zipf:
+        # Already-compressed formats are stored as-is; deflating them again
+        # costs CPU for next to no size reduction
+        stored = [_is_precompressed_format(arcname) for _, arcname, _ in files]
+        to_deflate = [(file_path, entry) for (file_path, _, entry), is_stored
+                      in zip(files, stored) if not is_stored]
+
+        total_size = sum(entry.stat().st_size for _, entry in to_deflate)
+        parallel = (compresslevel > 0 and len(to_deflate) > 1
+                    and total_size >= _PARALLEL_MIN_BYTES)
+
+        compressed = None
+        if parallel or (deflate is not None and compresslevel > 0):
+            # Compress entries independently (in worker processes when the
+            # bundle is large enough), then append the raw streams in order
+            compressed = _iter_compressed([file_path for file_path, _ in to_deflate],
+                                          compresslevel, parallel)
+
+        buf = memoryview(bytearray(_COPY_BUFSIZE))
+        for (file_path, arcname, entry), is_stored in zip(files, stored):
+            # Same fields ZipInfo.from_file sets, taken from the DirEntry's
+            # cached stat instead of stat'ing every file again
+            st = entry.stat()
+            zinfo = zipfile.ZipInfo(arcname, time.localtime(st.st_mtime)[:6])
+            zinfo.external_attr = (st.st_mode & 0xFFFF) << 16
+            zinfo.file_size = st.st_size
+            if is_stored:
+                zinfo.compress_type = zipfile.ZIP_STORED
+            else:
+                zinfo.compress_type = zipfile.ZIP_DEFLATED
+                zinfo._compresslevel = compresslevel
+
+            if compressed is not None and not is_stored:
+                crc, size, raw = next(compressed)
+                _write_precompressed(zipf, zinfo, raw, crc, size)
+                continue
+
+            # Unbuffered reads straight into the shared buffer: no second
+            # layer of Python buffering and no per-chunk allocation
+            with open(file_path, 'rb', buffering=0) as src, zipf.open(zinfo, 'w') as dst:
+                while n := src.readinto(buf):
+                    dst.write(buf[:n])
+
+
+def package_skill(skill_path, output_dir=None, compresslevel=DEFAULT_COMPRESSLEVEL,
+                  verbose=False, debug=False):
     """
     Package a skill folder into a zip file.
 
     Args:
         skill_path: Path to the skill folder
         output_dir: Optional output directory for the zip file (defaults to current directory)
+        compresslevel: Deflate level 0-9 (defaults to 1, fastest)
+        verbose: List every added file
+        debug: Also list every skipped file or directory
 
     Returns:
         Path to the created zip file, or None if error
     """
-    skill_path = Path(skill_path).resolve()
+    # absolute() does not touch the filesystem; only resolve() when '..'
+    # components would otherwise leak into the skill name or archive paths
+    skill_path = Path(skill_path)
+    skill_path = skill_path.resolve() if '..' in skill_path.parts else skill_path.absolute()
 
-    # Validate skill folder exists
-    if not skill_path.exists():
+    # Validate skill folder exists (one stat gives both existence and type)
+    try:
+        st = os.stat(skill_path)
+    except OSError:
         print(f"❌ Error: Skill folder not found: {skill_path}")
         return None
 
-    if not skill_path.is_dir():
+    if not stat.S_ISDIR(st.st_mode):
         print(f"❌ Error: Path is not a directory: {skill_path}")
         return None
 
-    # Validate SKILL.md exists
+    # Validate SKILL.md exists; read it once here and validate that content
+    # rather than having validate_skill() locate and read it again
     skill_md = skill_path / "SKILL.md"
-    if not skill_md.exists():
+    try:
+        skill_md_content = skill_md.read_text()
+    except OSError:
         print(f"❌ Error: SKILL.md not found in {skill_path}")
         return None
 
+    # Deferred so that usage errors and --help don't pay for the import
+    from quick_validate import validate_skill_md
+
     # Run validation before packaging
     print("🔍 Validating skill...")
-    valid, message = validate_skill(skill_path)
+    valid, message = validate_skill_md(skill_md_content)
     if not valid:
         print(f"❌ Validation failed: {message}")
         print("   Please fix the validation errors before packaging.")
@@ -69,34 +286,50 @@ def package_skill(skill_path, output_dir=None):
     allowed_paths = {'scripts', 'references', 'assets'}
     allowed_files = {'SKILL.md'}
 
+    # Walk only the whitelisted parts of the skill directory
+    skipped = []
+    root = str(skill_path)
+    parent_len = len(os.path.join(os.path.dirname(root), ''))
+
     # Create the zip file
     try:
-        with zipfile.ZipFile(zip_filename, 'w', zipfile.ZIP_DEFLATED) as zipf:
-            # Walk through the skill directory
-            for file_path in skill_path.rglob('*'):
-                if file_path.is_file():
-                    # Get the relative path from skill directory
-                    rel_path = file_path.relative_to(skill_path)
-
-                    # Check if this file should be included
-                    should_include = False
-
-                    # Check if it's SKILL.md
-                    if rel_path.name == 'SKILL.md' and len(rel_path.parts) == 1:
-                        should_include = True
-                    # Check if it's in allowed directories
-                    elif len(rel_path.parts) > 0 and rel_path.parts[0] in allowed_paths:
-                        # Skip Python cache files
-                        if '__pycache__' not in rel_path.parts and not file_path.name.endswith('.pyc'):
-                            should_include = True
-
-                    if should_include:
-                        # Calculate the relative path within the zip
-                        arcname = file_path.relative_to(skill_path.parent)
-                        zipf.write(file_path, arcname)
-                        print(f"  Added: {arcname}")
-                    else:
-                        print(f"  Skipped: {file_path.relative_to(skill_path.parent)}")
+        files = list(_scandir_filtered(
+            root, allowed_paths, allowed_files, parent_len, skipped))
+
+        # Build the archive in a temp file beside the destination and publish it
+        # with an atomic rename, so an interrupted run never leaves a partial zip
+        import tempfile
+
+        tmp = tempfile.NamedTemporaryFile(mode='wb', dir=output_path, delete=False,
+                                          prefix=f'.{skill_name}.', suffix='.zip.tmp')
+        try:
+            with tmp:
+                _write_archive(tmp, files, compresslevel)
+                tmp.flush()
+                os.fsync(tmp.fileno())
+
+            # NamedTemporaryFile is created 0600; give the zip the usual umask-based mode
+            umask = os.umask(0)
+            os.umask(umask)
+            os.chmod(tmp.name, 0o666 & ~umask)
+            os.replace(tmp.name, zip_filename)
+        except BaseException:
+            try:
+                os.unlink(tmp.name)
+            except OSError:
+                pass
+            raise
+
+        # Per-file report is opt-in and written in one go after compression
+        lines = []
+        if verbose or debug:
+            lines.extend(f"  Added: {arcname}\n" for _, arcname, _ in files)
+        if debug:
+            lines.extend(f"  Skipped: {arcname}\n" for arcname in skipped)
+        skipped_dirs = sum(1 for arcname in skipped if arcname.endswith('/'))
+        lines.append(f"  Added {len(files)} files, skipped {len(skipped) - skipped_dirs} files"
+                     f" and {skipped_dirs} directories\n")
+        sys.stdout.write(''.join(lines))
 
         print(f"\n✅ Successfully packaged skill to: {zip_filename}")
         return zip_filename
@@ -107,22 +340,38 @@ def package_skill(skill_path, output_dir=None):
 
 
 def main():
-    if len(sys.argv) < 2:
-        print("Usage: python utils/package_skill.py <path/to/skill-folder> [output-directory]")
-        print("\nExample:")
-        print("  python utils/package_skill.py skills/public/my-skill")
-        print("  python utils/package_skill.py skills/public/my-skill ./dist")
-        sys.exit(1)
+    parser = argparse.ArgumentParser(
+        description='Package a skill folder into a distributable zip file',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  %(prog)s skills/public/my-skill
+  %(prog)s skills/public/my-skill ./dist
+  %(prog)s skills/public/my-skill ./dist --level 9
+        """
+    )
 
-    skill_path = sys.argv[1]
-    output_dir = sys.argv[2] if len(sys.argv) > 2 else None
+    parser.add_argument('skill_path',
+                       help='Path to the skill folder')
+    parser.add_argument('output_dir', nargs='?',
+                       help='Output directory for the zip file (default: the skill folder)')
+    parser.add_argument('--level', type=int, default=DEFAULT_COMPRESSLEVEL,
+                       choices=range(0, 10), metavar='N',
+                       help=f'Deflate compression level 0-9 (default: {DEFAULT_COMPRESSLEVEL})')
+    parser.add_argument('--verbose', '-v', action='store_true',
+                       help='List every file added to the package')
+    parser.add_argument('--debug', action='store_true',
+                       help='Also list every skipped file or directory')
 
-    print(f"📦 Packaging skill: {skill_path}")
-    if output_dir:
-        print(f"   Output directory: {output_dir}")
+    args = parser.parse_args()
+
+    print(f"📦 Packaging skill: {args.skill_path}")
+    if args.output_dir:
+        print(f"   Output directory: {args.output_dir}")
     print()
 
-    result = package_skill(skill_path, output_dir)
+    result = package_skill(args.skill_path, args.output_dir, compresslevel=args.level,
+                           verbose=args.verbose, debug=args.debug)
 
     if result:
         sys.exit(0)
@@ -18,7 +18,10 @@ def validate_skill(skill_path):
         return False, "SKILL.md not found"
     
     # Read and validate frontmatter
-    content = skill_md.read_text()
+    return validate_skill_md(skill_md.read_text())
+
+def validate_skill_md(content):
+    """Validate the contents of a SKILL.md file"""
     if not content.startswith('---'):
         return False, "No YAML frontmatter found"
     